@@ -0,0 +1,182 @@
+"""
+Compare the object-based path (RouteGraph.dijkstra, then reading
+Vertex.distance and Vertex.previous) with the buffer-based path
+(optimalRouteAll) on a random road network
+
+For each path it reports the run time, the peak memory during the run, the
+memory still held by the result after the run, and the time to read the
+distance and predecessor of every vertex back.
+
+Usage: python benchmark.py [locations] [roads] [seed]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from optimal_route import (RouteGraph, countLocations, layeredRoads,
+                           optimalRouteAll)
+
+def randomRoads(total_locations, total_roads, seed):
+    """
+    Create a random road network where every location can be reached from
+    location 0
+
+    :Input:
+        total_locations: the number of locations, |L|
+        total_roads: the number of roads, |R|, at least |L|-1
+        seed: the seed of the random number generator
+
+    :Output/return: a tuple (passengers, roads) where passengers is a list of
+                    1% of the locations and roads is a list of tuples
+                    (a,b,c,d)
+
+    :Time complexity: O(|R|)
+    :Aux space complexity: O(|R|)
+    """
+    rng = random.Random(seed)
+
+    # a chain so that every location is reachable
+    roads = [(i, i+1, 5, 3) for i in range(total_locations - 1)]
+    for _ in range(total_roads - len(roads)):
+        a, b = rng.sample(range(total_locations), 2)
+        c = rng.randint(1, 50)
+        roads.append((a, b, c, rng.randint(1, c)))
+
+    passengers = rng.sample(range(1, total_locations), total_locations // 100)
+    return passengers, roads
+
+def runObjects(passengers, roads):
+    """
+    Run the object-based path, the RouteGraph has to be kept to read the
+    results from its Vertex objects
+
+    :Input:
+        passengers: a list of locations where there are passengers
+        roads: a list of tuples (a,b,c,d)
+
+    :Output/return: the RouteGraph after running dijkstra
+
+    :Time complexity: O(|R| log |L|)
+    :Aux space complexity: O(|L| + |R|)
+    """
+    total_locations = countLocations(roads)
+    preprocessed_roads, _ = layeredRoads(total_locations, list(passengers),
+                                         roads)
+    graph = RouteGraph(preprocessed_roads)
+    graph.dijkstra(0)
+    return graph
+
+def runBuffers(passengers, roads):
+    """
+    Run the buffer-based path
+
+    :Input:
+        passengers: a list of locations where there are passengers
+        roads: a list of tuples (a,b,c,d)
+
+    :Output/return: a tuple of buffers (distance, previous, layer)
+
+    :Time complexity: O(|R| log |L|)
+    :Aux space complexity: O(|L| + |R|)
+    """
+    return optimalRouteAll(0, list(passengers), roads)
+
+def readObjects(graph):
+    """
+    Read the distance and predecessor of every vertex from the RouteGraph
+
+    :Input:
+        graph: the RouteGraph returned by runObjects()
+
+    :Output/return: a tuple (total, checksum) where total is the number of
+                    vertices read and checksum is the sum of every value read
+
+    :Time complexity: O(|L|)
+    :Aux space complexity: O(1)
+    """
+    total = 0
+    checksum = 0
+    for vertex in graph.vertices:
+        checksum += vertex.distance
+        if vertex.previous is not None:
+            checksum += vertex.previous.id
+        else:
+            checksum -= 1
+        total += 1
+    return total, checksum
+
+def readBuffers(result):
+    """
+    Read the distance and predecessor of every vertex from the buffers
+
+    :Input:
+        result: the tuple of buffers returned by runBuffers()
+
+    :Output/return: a tuple (total, checksum) where total is the number of
+                    vertices read and checksum is the sum of every value read
+
+    :Time complexity: O(|L|)
+    :Aux space complexity: O(1)
+    """
+    distance, previous, _ = result
+    total = 0
+    checksum = 0
+    for v in range(len(previous)):
+        checksum += distance[v % len(distance)]
+        checksum += previous[v]
+        total += 1
+    return total, checksum
+
+def measure(name, run, read, passengers, roads):
+    """
+    Measure one path and print the result
+
+    The run time is measured without tracemalloc, because tracing every
+    allocation slows the run down. The memory is measured in a second run.
+
+    :Input:
+        name: the name of the path
+        run: the function that runs the path
+        read: the function that reads every vertex back
+        passengers: a list of locations where there are passengers
+        roads: a list of tuples (a,b,c,d)
+
+    :Output/Return: -
+    """
+    gc.collect()
+    start_time = time.perf_counter()
+    result = run(passengers, roads)
+    run_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    total_vertices, checksum = read(result)
+    read_time = time.perf_counter() - start_time
+
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    result = run(passengers, roads)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print("%-8s run %7.2f s  peak %8.1f MB  retained %8.1f MB  "
+          "read %7.1f ns/vertex  checksum %d" % (name, run_time, peak / 1e6,
+                                                 retained / 1e6,
+                                                 read_time / total_vertices
+                                                 * 1e9, checksum))
+
+if __name__ == "__main__":
+    total_locations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    total_roads = int(sys.argv[2]) if len(sys.argv) > 2 else 4 * total_locations
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    passengers, roads = randomRoads(total_locations, total_roads, seed)
+    print("|L| = %d, |R| = %d, |P| = %d" % (total_locations, len(roads),
+                                          len(passengers)))
+    measure("objects", runObjects, readObjects, passengers, roads)
+    measure("buffers", runBuffers, readBuffers, passengers, roads)
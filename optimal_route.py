@@ -1,3 +1,4 @@
+from array import array
 
 def optimalRoute(start, end, passengers, roads):
     """
@@ -53,6 +54,231 @@ def optimalRoute(start, end, passengers, roads):
     # find the total number of locations
     # O(|R|) time
     # O(1) aux space
+    total_locations = countLocations(roads)
+
+    # preprocess roads into a layered graph
+    # O(|L| log |L|) + O(|R| log |L|) + O(|R|) time
+    # O(|L| + |R|) aux space
+    preprocessed_roads, has_connection = \
+        layeredRoads(total_locations, passengers, roads)
+
+    # create graph
+    # O(|L| + |R|) time because
+    # O(|L| + |R|) aux space
+    graph = RouteGraph(preprocessed_roads)
+    
+    # run dijkstra
+    # O(|R| log |L|) time
+    # O(|L|) aux space
+    graph.dijkstra(start)
+
+    # return optimal route
+    shortest_route = [end]
+
+    if len(passengers) == 0 or has_connection == False:
+        current = end
+    
+    # for layered graph, we would have the vertex destination1 in layer 1
+    # and destination2 in layer 2, it is better to check which of these
+    # two nodes has the least distance
+    else:
+        if graph.vertices[end].distance \
+            <= graph.vertices[end+total_locations].distance:
+            current = end
+        else:
+            current = end + total_locations
+
+    # backtrack to obtain the optimal route
+    # starting from the destination location
+    # O(|R|) time
+    while current != start:
+        current = graph.vertices[current].previous.id
+        if current > total_locations -1: # for layered graph, we have a1 and a2
+            shortest_route.append(current-total_locations) # append a
+        else:
+            shortest_route.append(current)
+
+    # reverse the list because it start from the destination location
+    # O(log |R|) time
+    for i in range(len(shortest_route)//2):
+        shortest_route[i], shortest_route[len(shortest_route)-i-1] = \
+            shortest_route[len(shortest_route)-i-1], shortest_route[i]
+
+    return shortest_route    
+
+def optimalRouteAll(start, passengers, roads, distance=None, previous=None,
+                    layer=None):
+    """
+    Find the minimum total travel time from the departure location to every
+    location, writing the result into flat typed buffers instead of Vertex
+    objects
+
+    The same layered graph as optimalRoute() is used. The results are written
+    into buffers that support the buffer protocol (array.array, numpy arrays,
+    ...) through memoryviews, so no copy of the caller's buffers is made and
+    nothing is read back from Vertex.distance or Vertex.previous. The buffers
+    must have a signed integer format because -1 marks an unreachable vertex.
+
+    previous is indexed by layered vertex id, i.e. location a in layer 1 is
+    a and location a in layer 2 is a + |L|, because the best route to a
+    location in layer 2 may pass through a location whose own best layer is
+    layer 1. Use buildRoute() to rebuild a route from these buffers.
+
+    :Input:
+        start: the departure location
+        passengers: a list of locations where there are passengers
+        roads: a list of tuples (a,b,c,d) where a is the starting location, 
+               b is the ending location, c is the travel time if alone, and
+               d is the travel time if not alone
+        distance: a writable buffer of |L| signed integers wide enough to
+                  hold the sum of all travel times c, allocated as
+                  array('q') if None
+        previous: a writable buffer of 2|L| signed integers wide enough to
+                  hold 2|L|-1, allocated as array('q') if None
+        layer: a writable buffer of |L| signed integers, allocated as
+               array('b') if None
+
+    :Output/return: a tuple (distance, previous, layer) where distance[a] is
+                    the minimum total travel time to location a (-1 if a 
+                    cannot be reached), previous[v] is the layered vertex id
+                    before layered vertex v on its shortest route (-1 for the
+                    departure location and unreachable vertices) and layer[a]
+                    is 1 or 2, the layer in which a is reached with distance[a]
+                    (0 if a cannot be reached)
+
+    :Time complexity: O(|R| log |L|)
+    :Aux space complexity: O(|L| + |R|)
+    """
+    # find the total number of locations
+    # O(|R|) time
+    total_locations = countLocations(roads)
+
+    # allocate the output buffers if the caller has not given them
+    # O(|L|) aux space
+    if distance is None:
+        distance = array('q', bytes(8 * total_locations))
+    if previous is None:
+        previous = array('q', bytes(16 * total_locations))
+    if layer is None:
+        layer = array('b', bytes(total_locations))
+
+    # the longest shortest route uses every road at most once
+    # O(|R|) time
+    max_distance = 0
+    for road in roads:
+        max_distance += road[2]
+
+    # check every buffer before anything is written into them
+    # O(1) time
+    distance_view = checkBuffer(distance, total_locations, max_distance,
+                                "distance")
+    previous_view = checkBuffer(previous, 2 * total_locations, 
+                                2 * total_locations - 1, "previous")
+    layer_view = checkBuffer(layer, total_locations, 2, "layer")
+
+    # preprocess roads into a layered graph
+    # O(|L| log |L|) + O(|R| log |L|) + O(|R|) time
+    # O(|L| + |R|) aux space
+    preprocessed_roads, has_connection = \
+        layeredRoads(total_locations, passengers, roads)
+
+    # create graph
+    # O(|L| + |R|) time
+    # O(|L| + |R|) aux space
+    graph = RouteGraph(preprocessed_roads)
+
+    # run dijkstra on the layered graph
+    # O(|R| log |L|) time
+    # O(|L|) aux space
+    total_vertices = len(graph.vertices)
+    layered_distance = array('q', bytes(8 * total_vertices))
+    graph.dijkstra_into(start, layered_distance, previous_view)
+
+    # layer 2 does not exist if no passenger can be picked up
+    # O(|L|) time
+    for v in range(total_vertices, 2 * total_locations):
+        previous_view[v] = -1
+
+    # for every location, keep the layer with the least distance
+    # O(|L|) time
+    for a in range(total_locations):
+        distance_view[a] = layered_distance[a]
+        layer_view[a] = 1 if layered_distance[a] != -1 else 0
+
+        if has_connection:
+            carpool_distance = layered_distance[a + total_locations]
+            if carpool_distance != -1 and (distance_view[a] == -1 or
+                                           carpool_distance < distance_view[a]):
+                distance_view[a] = carpool_distance
+                layer_view[a] = 2
+
+    return distance, previous, layer
+
+def buildRoute(previous, layer, start, end):
+    """
+    Rebuild the optimal route from the departure location to a destination
+    location using the buffers filled in by optimalRouteAll()
+
+    :Input:
+        previous: the buffer of layered predecessors from optimalRouteAll()
+        layer: the buffer of final layers from optimalRouteAll()
+        start: the departure location that optimalRouteAll() was run from
+        end: the destination location
+
+    :Output/return: a list that represents the optimal route from the departure
+                    location to the destination location, or an empty list if
+                    the destination location cannot be reached
+
+    :Raises: ValueError if start is not the departure location that the
+             buffers were filled in from
+
+    :Time complexity: O(|L|) because a route visits each layered vertex at
+                      most once
+    :Aux space complexity: O(|L|)
+    """
+    end_layer = int(layer[end])
+    if end_layer == 0:
+        return []
+
+    total_locations = len(layer)
+
+    # start from the destination location in its final layer
+    current = end + (end_layer - 1) * total_locations
+    shortest_route = [end]
+
+    # backtrack to obtain the optimal route until the departure location,
+    # which is the only reachable vertex without a predecessor
+    # O(|L|) time
+    while int(previous[current]) != -1:
+        current = int(previous[current])
+        shortest_route.append(current % total_locations)
+
+    if current != start:
+        raise ValueError("the buffers were filled in from departure location "
+                         + str(current) + ", not " + str(start))
+
+    # reverse the list because it start from the destination location
+    # O(|L|) time
+    for i in range(len(shortest_route)//2):
+        shortest_route[i], shortest_route[len(shortest_route)-i-1] = \
+            shortest_route[len(shortest_route)-i-1], shortest_route[i]
+
+    return shortest_route
+
+def countLocations(roads):
+    """
+    Find the total number of locations from the given roads
+
+    :Input:
+        roads: a list of tuples where the first two items are the starting
+               and ending location of the road
+
+    :Output/return: an integer that represents the number of locations, which
+                    is the largest location plus one
+
+    :Time complexity: O(|R|)
+    :Aux space complexity: O(1)
+    """
     max_id = roads[0][0]
     for i in range(len(roads)):
         if roads[i][0] > max_id:
@@ -60,8 +286,30 @@ def optimalRoute(start, end, passengers, roads):
         if roads[i][1] > max_id:
             max_id = roads[i][1]
 
-    total_locations = max_id + 1
+    return max_id + 1
+
+def layeredRoads(total_locations, passengers, roads):
+    """
+    Preprocess the roads into the roads of the layered graph described in
+    optimalRoute()
 
+    :Input:
+        total_locations: the number of locations, |L|
+        passengers: a list of locations where there are passengers, it will
+                    be sorted in place
+        roads: a list of tuples (a,b,c,d) where a is the starting location, 
+               b is the ending location, c is the travel time if alone, and
+               d is the travel time if not alone
+
+    :Output/return: a tuple (preprocessed_roads, has_connection) where 
+                    preprocessed_roads is a list of tuples (u,v,w) and 
+                    has_connection is True if layer 2 can be entered from
+                    layer 1, False otherwise
+
+    :Time complexity: O(|L| log |L|) + O(|R| log |L|) + O(|R|) 
+                      = O(|R| log |L|)
+    :Aux space complexity: O(|L| + |R|)
+    """
     # sort passengers in order to perform binary search
     # O(|L| log |L|) time because |P| <= |L|-2 
     # O(|L|) aux space because |P| <= |L|-2
@@ -97,49 +345,41 @@ def optimalRoute(start, end, passengers, roads):
                             road[3])                    # (a,b,d)
             preprocessed_roads.append(road_carpool)
 
-    # create graph
-    # O(|L| + |R|) time because
-    # O(|L| + |R|) aux space
-    graph = RouteGraph(preprocessed_roads)
-    
-    # run dijkstra
-    # O(|R| log |L|) time
-    # O(|L|) aux space
-    graph.dijkstra(start)
+    return preprocessed_roads, has_connection
 
-    # return optimal route
-    shortest_route = [end]
+def checkBuffer(buffer, size, max_value, name):
+    """
+    Get a writable one-dimensional view of a buffer without copying it
 
-    if len(passengers) == 0 or has_connection == False:
-        current = end
-    
-    # for layered graph, we would have the vertex destination1 in layer 1
-    # and destination2 in layer 2, it is better to check which of these
-    # two nodes has the least distance
-    else:
-        if graph.vertices[end].distance \
-            <= graph.vertices[end+total_locations].distance:
-            current = end
-        else:
-            current = end + total_locations
+    The buffer must have a signed integer format, because -1 is written into
+    it, and its items must be wide enough to hold max_value.
 
-    # backtrack to obtain the optimal route
-    # starting from the destination location
-    # O(|R|) time
-    while current != start:
-        current = graph.vertices[current].previous.id
-        if current > total_locations -1: # for layered graph, we have a1 and a2
-            shortest_route.append(current-total_locations) # append a
-        else:
-            shortest_route.append(current)
+    :Input:
+        buffer: an object that supports the buffer protocol
+        size: the number of items the buffer must hold
+        max_value: the largest integer that will be written into the buffer
+        name: the name of the buffer, used in the error message
 
-    # reverse the list because it start from the destination location
-    # O(log |R|) time
-    for i in range(len(shortest_route)//2):
-        shortest_route[i], shortest_route[len(shortest_route)-i-1] = \
-            shortest_route[len(shortest_route)-i-1], shortest_route[i]
+    :Output/return: a memoryview of the buffer
 
-    return shortest_route    
+    :Time complexity: O(1)
+    :Aux space complexity: O(1)
+    """
+    view = memoryview(buffer)
+    if view.readonly or view.ndim != 1 or len(view) != size:
+        raise ValueError(name + " must be a writable one-dimensional buffer "
+                         "of " + str(size) + " items")
+
+    # ignore the byte order prefix, e.g. '<q' from numpy
+    item_format = view.format.lstrip("@=<>!")
+    if item_format not in ("b", "h", "i", "l", "q", "n"):
+        raise ValueError(name + " must be a buffer of signed integers, not "
+                         "format '" + view.format + "'")
+
+    if max_value >= 2 ** (8 * view.itemsize - 1):
+        raise ValueError(name + " items of " + str(view.itemsize) + 
+                         " bytes cannot hold " + str(max_value))
+    return view
 
 def binarySearch(list, target):
     """
@@ -287,6 +527,68 @@ class RouteGraph:
                         v.previous = u
                         heap.update(v.id, v.distance)
 
+    def dijkstra_into(self, source, distance, previous):
+        """
+        Find the shortest path from the departure location to all other 
+        vertices, writing the result into flat buffers
+
+        Unlike dijkstra(), the visited and discovered states are kept in local
+        arrays instead of the Vertex objects, so the graph is not modified and
+        this can be run again from another departure location.
+
+        :Input:
+            self: a reference to the RouteGraph object
+            source: an integer that represents the departure location
+            distance: a writable buffer of at least len(self.vertices) 
+                      integers, distance[v] will be the distance to v, or -1
+                      if v is unreachable
+            previous: a writable buffer of at least len(self.vertices)
+                      integers, previous[v] will be the id of the vertex
+                      before v on the shortest path, or -1 for the source and
+                      unreachable vertices
+
+        :Output/Return: -
+
+        :Time complexity: O(|R| log |L|)
+        :Aux space complexity: O(|L|)
+        """
+        # find number of vertices
+        total_vertices = len(self.vertices)
+
+        # reset the buffers, -1 marks a vertex that is not discovered
+        # O(|L|) time
+        for i in range(total_vertices):
+            distance[i] = -1
+            previous[i] = -1
+        visited = bytearray(total_vertices)
+
+        # initialzie heap of size total_vertices
+        heap = MinHeap(total_vertices + 1)
+
+        # add source to heap
+        distance[source] = 0
+        heap.add((source, 0))
+
+        while heap.length > 0:
+            u = heap.serve()[0]     # element in heap is (vertex id, distance)
+            visited[u] = True
+            u_distance = distance[u]
+
+            # for every adjacent vertices of u
+            for edge in self.vertices[u].edges:
+                v = edge.v
+
+                if distance[v] == -1:
+                    distance[v] = u_distance + edge.w
+                    previous[v] = u
+                    heap.add((v, distance[v]))
+
+                elif not visited[v]:
+                    if distance[v] > u_distance + edge.w:
+                        distance[v] = u_distance + edge.w
+                        previous[v] = u
+                        heap.update(v, distance[v])
+
     def __str__(self):
         """
         Display the graph
@@ -620,6 +922,7 @@ class MinHeap:
 
         # replace the root element with the last element in the heap
         self.the_array[1] = self.the_array[self.length]
+        self.index_array[self.the_array[1][0]] = 1
 
         # reduce the length of the heap by 1
         self.the_array[self.length] = None
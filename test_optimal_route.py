@@ -0,0 +1,143 @@
+"""
+Tests for optimal_route.py
+"""
+import random
+from array import array
+
+import pytest
+
+from optimal_route import buildRoute, optimalRoute, optimalRouteAll
+
+def routeCost(route, passengers, roads):
+    """
+    Find the total travel time of a route, driving on carpool lanes once a
+    passenger has been picked up
+
+    :Input:
+        route: a list of locations
+        passengers: a list of locations where there are passengers
+        roads: a list of tuples (a,b,c,d)
+
+    :Output/return: the total travel time of the route
+    """
+    fastest = {}
+    for a, b, c, d in roads:
+        if (a, b) in fastest:
+            c = min(c, fastest[(a, b)][0])
+            d = min(d, fastest[(a, b)][1])
+        fastest[(a, b)] = (c, d)
+
+    total = 0
+    has_passenger = False
+    for a, b in zip(route, route[1:]):
+        if a in passengers:
+            has_passenger = True
+        c, d = fastest[(a, b)]
+        total += d if has_passenger else c
+    return total
+
+def randomRoads(rng, total_locations):
+    """
+    Create random roads on a cycle through every location, so that every
+    location can be reached in both layers
+
+    :Input:
+        rng: a random number generator
+        total_locations: the number of locations
+
+    :Output/return: a list of tuples (a,b,c,d)
+    """
+    roads = []
+    for a in range(total_locations):
+        c = rng.randint(1, 20)
+        roads.append((a, (a + 1) % total_locations, c, rng.randint(1, c)))
+    for _ in range(rng.randint(0, 3 * total_locations)):
+        a, b = rng.sample(range(total_locations), 2)
+        c = rng.randint(1, 20)
+        roads.append((a, b, c, rng.randint(1, c)))
+    return roads
+
+def test_serve_keeps_heap_index_in_sync():
+    roads = [(2, 4, 7, 6), (4, 5, 1, 1), (2, 3, 1, 1), (0, 2, 5, 1),
+             (0, 3, 8, 3), (1, 5, 6, 4), (3, 1, 4, 2)]
+    assert optimalRoute(0, 5, [], roads) == [0, 2, 4, 5]
+
+def test_optimal_route_all_agrees_with_optimal_route():
+    rng = random.Random(0)
+    for _ in range(300):
+        total_locations = rng.randint(3, 9)
+        roads = randomRoads(rng, total_locations)
+        start = rng.randrange(total_locations)
+        others = [a for a in range(total_locations) if a != start]
+        passengers = rng.sample(others, rng.randint(1, len(others) - 1))
+
+        distance, previous, layer = optimalRouteAll(start, list(passengers),
+                                                    roads)
+
+        for end in others:
+            route = buildRoute(previous, layer, start, end)
+            assert route[0] == start and route[-1] == end
+            assert routeCost(route, passengers, roads) == distance[end]
+
+            if end not in passengers:
+                expected = optimalRoute(start, end, list(passengers), roads)
+                assert routeCost(expected, passengers, roads) == distance[end]
+
+def test_route_in_layer_2_through_location_in_layer_1():
+    roads = [(0, 1, 5, 3), (1, 2, 4, 1), (2, 3, 1, 1), (0, 3, 20, 2)]
+    distance, previous, layer = optimalRouteAll(0, [1], roads)
+
+    assert list(distance) == [0, 5, 6, 7]
+    assert list(layer) == [1, 1, 2, 2]
+    assert buildRoute(previous, layer, 0, 3) == [0, 1, 2, 3]
+    assert all(type(a) is int for a in buildRoute(previous, layer, 0, 3))
+
+def test_build_route_rejects_other_start():
+    roads = [(0, 1, 5, 3), (1, 2, 4, 1), (2, 3, 1, 1), (0, 3, 20, 2)]
+    distance, previous, layer = optimalRouteAll(0, [1], roads)
+
+    with pytest.raises(ValueError):
+        buildRoute(previous, layer, 3, 1)
+    with pytest.raises(ValueError):
+        buildRoute(previous, layer, 1, 3)
+
+def test_unreachable_location():
+    roads = [(0, 1, 1, 1), (3, 2, 1, 1)]
+    distance, previous, layer = optimalRouteAll(0, [], roads)
+
+    assert list(distance) == [0, 1, -1, -1]
+    assert list(layer) == [1, 1, 0, 0]
+    assert buildRoute(previous, layer, 0, 2) == []
+
+@pytest.mark.parametrize("buffers", [
+    {"distance": bytearray(4)},
+    {"distance": array('Q', [0] * 4)},
+    {"previous": array('L', [0] * 8)},
+    {"layer": bytearray(4)},
+    {"layer": array('d', [0] * 4)},
+    {"distance": array('q', [0] * 3)},
+])
+def test_rejects_wrong_buffers(buffers):
+    roads = [(0, 1, 1, 1), (3, 2, 1, 1)]
+    distance = buffers.get("distance", array('q', [9] * 4))
+
+    with pytest.raises(ValueError):
+        optimalRouteAll(0, [], roads, distance, buffers.get("previous"),
+                        buffers.get("layer"))
+
+    # nothing is written before the buffers are checked
+    if "distance" not in buffers:
+        assert list(distance) == [9] * 4
+
+def test_rejects_narrow_buffers():
+    roads = [(0, 1, 40000, 1), (1, 2, 40000, 1)]
+    with pytest.raises(ValueError):
+        optimalRouteAll(0, [], roads, distance=array('h', [0] * 3))
+
+    roads = [(a, a + 1, 1, 1) for a in range(99)]
+    with pytest.raises(ValueError):
+        optimalRouteAll(0, [], roads, previous=array('b', [0] * 200))
+
+    distance, _, _ = optimalRouteAll(0, [], roads, array('h', [0] * 100),
+                                     array('h', [0] * 200))
+    assert distance[99] == 99